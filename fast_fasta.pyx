@@ -0,0 +1,63 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C hot path for fa2jsonserver.py.
+
+Build in place (requires Cython and a C compiler):
+
+    cythonize -i fast_fasta.pyx
+
+fa2jsonserver imports this module if present and falls back to its pure-Python
+path otherwise, so building it is never required.
+"""
+
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+
+
+# Per-byte tables, filled once at import:
+#   SKIP[c]  -> whitespace byte, dropped from the output
+#   UPPER[c] -> uppercased byte (identity for non-letters)
+#   AA20[c]  -> 1 if the (uppercased) byte is one of the 20 standard AAs
+cdef unsigned char SKIP[256]
+cdef unsigned char UPPER[256]
+cdef unsigned char AA20[256]
+
+cdef int _i
+for _i in range(256):
+    SKIP[_i] = 0
+    UPPER[_i] = _i
+    AA20[_i] = 0
+for _i in b" \t\r\n":
+    SKIP[_i] = 1
+for _i in range(ord("a"), ord("z") + 1):
+    UPPER[_i] = _i - 32
+for _i in b"ACDEFGHIKLMNPQRSTVWY":
+    AA20[_i] = 1
+
+
+def clean_seq(bytes seq):
+    """Uppercase, strip whitespace, and AA20-check a sequence in one C pass.
+
+    Returns (cleaned_bytes, aa20_ok). The caller decides whether a False
+    aa20_ok is an error (strict mode) or not.
+    """
+    cdef const unsigned char* src = seq
+    cdef Py_ssize_t n = len(seq)
+    cdef bytes buf = PyBytes_FromStringAndSize(NULL, n)
+    cdef unsigned char* dst = <unsigned char*> PyBytes_AS_STRING(buf)
+    cdef Py_ssize_t i, j = 0
+    cdef unsigned char c
+    cdef bint ok = 1
+
+    for i in range(n):
+        c = src[i]
+        if SKIP[c]:
+            continue
+        c = UPPER[c]
+        if not AA20[c]:
+            ok = 0
+        dst[j] = c
+        j += 1
+
+    if j != n:
+        buf = buf[:j]
+    return buf, bool(ok)